@@ -10,31 +10,37 @@ N = 50
 box = lms.state.Box(10.0)
 state = lms.state.State(N,box)
 
-# insert particles randomly without overlap
-for i in range(state.N):
-    found = False
-    attempt = 0
-    max_attempts = 100
-    while not found and attempt < max_attempts:
-        ri = state.box.L*np.random.uniform(0.0,1.0,3)
-        dr = state.box.minimum_image(state.positions[:i] - ri)
+# insert particles randomly without overlap using rejection-sampled Poisson-disk:
+# batch-generate trial positions, compute all squared pair distances once, then
+# greedily keep trials at least 1 away from every previously kept trial
+# (the overlap test compares rsq >= 1 so no square roots are evaluated)
+rng = np.random.default_rng()
+num_trials = 20*state.N
+trials = state.box.L*rng.uniform(0.0,1.0,(num_trials,3))
+dr = trials[None,:,:]-trials[:,None,:]
+dr -= np.rint(dr/state.box.L)*state.box.L
+rsq = np.einsum('ijk,ijk->ij',dr,dr)
 
-        found = (i == 0 or np.all(np.linalg.norm(dr,axis=1) >= 1.0))
-
-        if found:
-            state.positions[i] = ri
-        attempt += 1
-
-    if not found:
-        raise RuntimeError('Unable to place all particles')
+keep = np.zeros(num_trials,dtype=bool)
+num_kept = 0
+for i in range(num_trials):
+    if np.all(rsq[i,keep] >= 1.0):
+        keep[i] = True
+        num_kept += 1
+        if num_kept == state.N:
+            break
+if num_kept < state.N:
+    raise RuntimeError('Unable to place all particles')
+state.positions = trials[keep]
 
 # randomize the velocities with zero initial mean and temperature kT_target
-state.velocities = np.random.normal(0.0,np.sqrt(kT_target/state.mass),(state.N,3))
+state.velocities = rng.normal(0.0,np.sqrt(kT_target/state.mass),(state.N,3))
 state.velocities -= np.mean(state.velocities, axis=0)
 
-# WCA potential + Verlet integration
+# WCA potential + Verlet integration + rescaling thermostat for equilibration
 lj = lms.potential.LennardJones(1.0,1.0,2**(1./6.),shift=True)
 nve = lms.dynamics.VelocityVerlet(0.005,lj)
+thermostat = lms.dynamics.Thermostat(kT_target,tol=0.02)
 
 # analysis tools
 analyze_every = 50
@@ -46,27 +52,32 @@ with open('thermo.log','w') as f:
     # ensure system forces are initialized before starting run, or analysis will fail
     state.energies,state.forces = lj.compute(state)
 
+    # kT is computed once per step after integration and carried into the next
+    # step's analysis, so the velocity array is only reduced once per step
+    kT = thermo.kT(state)
+    steps_until_analyze = 0
+
     # advance 5000 steps
     while state.counter < 5000:
         # perform analysis at the beginning of the step
-        if state.counter % analyze_every == 0:
+        if steps_until_analyze == 0:
             # report the counter
             print(state.counter)
 
             # dump state
             xyz.write(state)
 
-            # compute thermo properties
-            kT = thermo.kT(state)
+            # log thermo properties, reusing the kT carried over from last step
             P = thermo.pressure(state)
             f.write('{} {} {}\n'.format(state.counter,kT,P))
             f.flush()
 
+            steps_until_analyze = analyze_every
+
         # integration step
         nve.advance(state)
+        steps_until_analyze -= 1
 
         # rescale the temperature if it wanders too far (bad thermostat, but it works OK here)
-        kT = thermo.kT(state)
-        if np.abs(kT-kT_target)/kT_target > 0.02:
-            state.velocities *= np.sqrt(kT_target/kT)
+        kT = thermostat.apply(state)
 
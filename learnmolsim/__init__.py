@@ -1,5 +1,6 @@
 from . import analyze
 from . import dynamics
+from . import neighbor
 from . import potential
 from . import state
 from . import write
@@ -0,0 +1,275 @@
+"""
+Compiled kernels
+================
+
+Optional compiled kernels for the hottest inner loops. The ahead-of-time
+compiled C extension (built by ``setup.py`` when a compiler is available) is
+preferred, then a numba just-in-time kernel. Neither is a required dependency,
+so each kernel is ``None`` when it is unavailable and callers fall back to
+their pure NumPy implementations.
+
+Setting the environment variable ``LEARNMOLSIM_NO_JIT=1`` disables all
+compiled kernels, which is useful for debugging and for timing the pure
+NumPy implementations. ``LEARNMOLSIM_THREADS`` pins the number of numba
+threads, e.g., for deterministic single-threaded runs.
+
+"""
+import os
+
+import numpy as np
+
+if os.environ.get('LEARNMOLSIM_NO_JIT'):
+    _lj = None
+    numba = None
+else:
+    try:
+        from . import _lj
+    except ImportError:
+        _lj = None
+
+    try:
+        import numba
+    except ImportError:
+        numba = None
+
+if numba is not None and os.environ.get('LEARNMOLSIM_THREADS'):
+    # pin the thread count, e.g., for deterministic single-threaded test runs
+    numba.set_num_threads(int(os.environ['LEARNMOLSIM_THREADS']))
+
+if numba is not None:
+    # no cache=True: the thread-id lookups count as dynamic globals, which
+    # numba cannot cache on disk (it would warn and recompile every process)
+    @numba.njit(parallel=True, fastmath=True)
+    def _lj_forces_jit(x, y, z, L, epsilon, sigma, rcut2, ushift):
+        """Fused Lennard-Jones pair loop.
+
+        Evaluates the minimum image, squared distance, energy, and force for
+        every pair in one scalar loop with no array temporaries. The outer
+        loop is parallelized with ``prange`` over a triangular pair loop, so
+        each pair is visited once and Newton's third law supplies the reaction
+        force. The symmetric write to particle *j* would race between threads,
+        so each thread accumulates into its own scratch buffers, which are
+        reduced at the end — a cheap O(threads*N) pass. The coordinates come
+        in as separate contiguous component arrays for unit-stride loads.
+
+        Parameters
+        ----------
+        x : :class:`numpy.ndarray`
+            Particle *x* coordinates.
+        y : :class:`numpy.ndarray`
+            Particle *y* coordinates.
+        z : :class:`numpy.ndarray`
+            Particle *z* coordinates.
+        L : :class:`numpy.ndarray`
+            Box edge lengths.
+        epsilon : float
+            Interaction energy.
+        sigma : float
+            Interaction length.
+        rcut2 : float
+            Squared truncation distance.
+        ushift : float
+            Energy subtracted inside the cutoff (0 if not shifting).
+
+        Returns
+        -------
+        :class:`numpy.ndarray`
+            Potential energy assigned to each particle.
+        :class:`numpy.ndarray`
+            Force on each particle.
+
+        """
+        N = x.shape[0]
+        nthreads = numba.get_num_threads()
+        u_thr = np.zeros((nthreads,N), dtype=np.float64)
+        f_thr = np.zeros((nthreads,3,N), dtype=np.float64)
+        sigma2 = sigma*sigma
+        # hoisted reciprocals save a division per pair in the minimum image
+        invLx = 1.0/L[0]
+        invLy = 1.0/L[1]
+        invLz = 1.0/L[2]
+
+        for i in numba.prange(N):
+            tid = numba.get_thread_id()
+            for j in range(i+1, N):
+                # minimum image of the vector from j to i, fused per component
+                dx = x[i]-x[j]
+                dx -= L[0]*np.rint(dx*invLx)
+                dy = y[i]-y[j]
+                dy -= L[1]*np.rint(dy*invLy)
+                dz = z[i]-z[j]
+                dz -= L[2]*np.rint(dz*invLz)
+
+                rsq = dx*dx+dy*dy+dz*dz
+                if rsq < rcut2:
+                    r6i = (sigma2/rsq)**3
+                    # half the pair energy assigned to each particle
+                    uij = 0.5*(4.*epsilon*r6i*(r6i-1.)-ushift)
+                    u_thr[tid,i] += uij
+                    u_thr[tid,j] += uij
+                    firj = 24.*epsilon*r6i*(2.*r6i-1.)/rsq
+                    f_thr[tid,0,i] += firj*dx
+                    f_thr[tid,1,i] += firj*dy
+                    f_thr[tid,2,i] += firj*dz
+                    f_thr[tid,0,j] -= firj*dx
+                    f_thr[tid,1,j] -= firj*dy
+                    f_thr[tid,2,j] -= firj*dz
+
+        # transpose of the reduced (3,N) buffer is an (N,3) column-major view
+        return u_thr.sum(axis=0), f_thr.sum(axis=0).T
+
+if _lj is not None:
+    def lj_forces(x, y, z, L, epsilon, sigma, rcut2, ushift):
+        """Fused Lennard-Jones pair loop in the C extension.
+
+        Same contract as the numba kernel, but pairs are visited once with
+        symmetric third-law write-back.
+
+        """
+        return _lj.compute(x, y, z, L, epsilon, sigma, rcut2, ushift)
+elif numba is not None:
+    lj_forces = _lj_forces_jit
+else:
+    lj_forces = None
+
+if numba is not None:
+    @numba.njit(fastmath=True, cache=True)
+    def thermo_scan(v, e, r, f, mass):
+        """Fused reduction of the thermodynamic sums.
+
+        Computes the kinetic energy, potential energy, and virial in one pass
+        over the particles, so the arrays stream through memory once instead
+        of once per property.
+
+        Parameters
+        ----------
+        v : :class:`numpy.ndarray`
+            ``(N,3)`` particle velocities.
+        e : :class:`numpy.ndarray`
+            ``(N,)`` particle energies.
+        r : :class:`numpy.ndarray`
+            ``(N,3)`` particle positions.
+        f : :class:`numpy.ndarray`
+            ``(N,3)`` particle forces.
+        mass : float
+            Particle mass.
+
+        Returns
+        -------
+        float
+            Kinetic energy.
+        float
+            Potential energy.
+        float
+            Virial sum of the position-force dot products.
+
+        """
+        N = v.shape[0]
+        vsq = 0.
+        pe = 0.
+        vir = 0.
+        for i in range(N):
+            for k in range(3):
+                vsq += v[i,k]*v[i,k]
+                vir += r[i,k]*f[i,k]
+            pe += e[i]
+        return 0.5*mass*vsq, pe, vir
+
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def verlet_kick_drift(r, v, f, im, L, half_dt_by_m, dt):
+        """Fused first half of a velocity Verlet step.
+
+        Applies the half kick, the drift, and the periodic wrap (including the
+        image update) in place in one pass over the particles, so the arrays
+        stream through memory once instead of once per operation.
+
+        Parameters
+        ----------
+        r : :class:`numpy.ndarray`
+            ``(N,3)`` particle positions, updated in place.
+        v : :class:`numpy.ndarray`
+            ``(N,3)`` particle velocities, updated in place.
+        f : :class:`numpy.ndarray`
+            ``(N,3)`` particle forces.
+        im : :class:`numpy.ndarray`
+            ``(N,3)`` particle images, updated in place.
+        L : :class:`numpy.ndarray`
+            Box edge lengths.
+        half_dt_by_m : float
+            Half kick prefactor ``0.5*dt/m``.
+        dt : float
+            Integration time step.
+
+        """
+        N = r.shape[0]
+        invL = 1.0/L
+        for i in numba.prange(N):
+            for k in range(3):
+                v[i,k] += half_dt_by_m*f[i,k]
+                xk = r[i,k]+dt*v[i,k]
+                num_image = np.floor(xk*invL[k])
+                r[i,k] = xk-num_image*L[k]
+                im[i,k] += np.int32(num_image)
+
+    # no cache=True: calling the other jitted kernels counts as dynamic
+    # globals, which numba cannot cache on disk
+    @numba.njit(fastmath=True)
+    def verlet_run(r, v, f, im, L, half_dt_by_m, dt, nsteps,
+                   epsilon, sigma, rcut2, ushift):
+        """Run whole velocity Verlet trajectories without returning to Python.
+
+        Each Python-level call to an integrator step costs interpreter
+        dispatch, which dominates the step time for small systems. This driver
+        keeps the entire ``nsteps`` loop — half kick, drift and wrap, force
+        recompute, second half kick — inside one compiled function. The
+        positions, velocities, forces, and images are all updated in place.
+
+        Parameters
+        ----------
+        r : :class:`numpy.ndarray`
+            ``(N,3)`` particle positions, updated in place.
+        v : :class:`numpy.ndarray`
+            ``(N,3)`` particle velocities, updated in place.
+        f : :class:`numpy.ndarray`
+            ``(N,3)`` particle forces, updated in place. Must hold the forces
+            at the current positions on entry.
+        im : :class:`numpy.ndarray`
+            ``(N,3)`` particle images, updated in place.
+        L : :class:`numpy.ndarray`
+            Box edge lengths.
+        half_dt_by_m : float
+            Half kick prefactor ``0.5*dt/m``.
+        dt : float
+            Integration time step.
+        nsteps : int
+            Number of steps to take.
+        epsilon : float
+            Interaction energy.
+        sigma : float
+            Interaction length.
+        rcut2 : float
+            Squared truncation distance.
+        ushift : float
+            Energy subtracted inside the cutoff (0 if not shifting).
+
+        Returns
+        -------
+        :class:`numpy.ndarray`
+            Potential energy assigned to each particle at the final step.
+
+        """
+        N = r.shape[0]
+        u = np.zeros(N, dtype=np.float64)
+        for _ in range(nsteps):
+            verlet_kick_drift(r, v, f, im, L, half_dt_by_m, dt)
+            u,fnew = _lj_forces_jit(r[:,0], r[:,1], r[:,2], L,
+                                    epsilon, sigma, rcut2, ushift)
+            for i in range(N):
+                for k in range(3):
+                    f[i,k] = fnew[i,k]
+                    v[i,k] += half_dt_by_m*f[i,k]
+        return u
+else:
+    thermo_scan = None
+    verlet_kick_drift = None
+    verlet_run = None
@@ -0,0 +1,179 @@
+/* Optional compiled backend for the Lennard-Jones pair loop.
+ *
+ * Implements the same fused kernel as the numba version in _kernels.py:
+ * minimum image, squared distance, energy, and force per pair with no
+ * array temporaries. Pairs are visited once (i < j) with symmetric
+ * third-law write-back. Building this extension is optional; see setup.py.
+ */
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+
+#define NPY_NO_DEPRECATED_API NPY_1_7_API_VERSION
+#include <numpy/arrayobject.h>
+
+#include <math.h>
+#include <stdlib.h>
+
+#ifdef _OPENMP
+#include <omp.h>
+#endif
+
+static PyObject*
+compute(PyObject* self, PyObject* args)
+    {
+    PyObject *x_obj, *y_obj, *z_obj, *L_obj;
+    double epsilon, sigma, rcut2, ushift;
+    if (!PyArg_ParseTuple(args, "OOOOdddd",
+                          &x_obj, &y_obj, &z_obj, &L_obj,
+                          &epsilon, &sigma, &rcut2, &ushift))
+        {
+        return NULL;
+        }
+
+    PyArrayObject* x = (PyArrayObject*)PyArray_FROM_OTF(x_obj, NPY_FLOAT64, NPY_ARRAY_IN_ARRAY);
+    PyArrayObject* y = (PyArrayObject*)PyArray_FROM_OTF(y_obj, NPY_FLOAT64, NPY_ARRAY_IN_ARRAY);
+    PyArrayObject* z = (PyArrayObject*)PyArray_FROM_OTF(z_obj, NPY_FLOAT64, NPY_ARRAY_IN_ARRAY);
+    PyArrayObject* L = (PyArrayObject*)PyArray_FROM_OTF(L_obj, NPY_FLOAT64, NPY_ARRAY_IN_ARRAY);
+    if (!x || !y || !z || !L)
+        {
+        Py_XDECREF(x); Py_XDECREF(y); Py_XDECREF(z); Py_XDECREF(L);
+        return NULL;
+        }
+
+    const npy_intp N = PyArray_DIM(x, 0);
+    npy_intp u_dims[1] = {N};
+    npy_intp f_dims[2] = {N, 3};
+    PyArrayObject* u_arr = (PyArrayObject*)PyArray_ZEROS(1, u_dims, NPY_FLOAT64, 0);
+    PyArrayObject* f_arr = (PyArrayObject*)PyArray_ZEROS(2, f_dims, NPY_FLOAT64, 0);
+    if (!u_arr || !f_arr)
+        {
+        Py_XDECREF(u_arr); Py_XDECREF(f_arr);
+        Py_DECREF(x); Py_DECREF(y); Py_DECREF(z); Py_DECREF(L);
+        return NULL;
+        }
+
+    /* restrict promises no aliasing between the buffers, which lets the
+     * compiler keep loads in registers and auto-vectorize the loops */
+    const double* restrict rx = (const double*)PyArray_DATA(x);
+    const double* restrict ry = (const double*)PyArray_DATA(y);
+    const double* restrict rz = (const double*)PyArray_DATA(z);
+    const double* restrict box = (const double*)PyArray_DATA(L);
+    double* restrict u = (double*)PyArray_DATA(u_arr);
+    double* restrict f = (double*)PyArray_DATA(f_arr);
+
+    const double sigma2 = sigma*sigma;
+    const double invLx = 1.0/box[0];
+    const double invLy = 1.0/box[1];
+    const double invLz = 1.0/box[2];
+
+#ifdef _OPENMP
+    const int nthreads = omp_get_max_threads();
+#else
+    const int nthreads = 1;
+#endif
+
+    /* per-thread scratch for the symmetric write-back avoids atomics: each
+     * thread accumulates into its own copy, which are reduced afterwards */
+    double* u_tls = (double*)calloc((size_t)nthreads*N, sizeof(double));
+    double* f_tls = (double*)calloc((size_t)nthreads*N*3, sizeof(double));
+    if (!u_tls || !f_tls)
+        {
+        free(u_tls); free(f_tls);
+        Py_DECREF(u_arr); Py_DECREF(f_arr);
+        Py_DECREF(x); Py_DECREF(y); Py_DECREF(z); Py_DECREF(L);
+        return PyErr_NoMemory();
+        }
+
+    Py_BEGIN_ALLOW_THREADS
+#ifdef _OPENMP
+    #pragma omp parallel
+#endif
+        {
+#ifdef _OPENMP
+        const int tid = omp_get_thread_num();
+#else
+        const int tid = 0;
+#endif
+        double* restrict ul = u_tls + (size_t)tid*N;
+        double* restrict fl = f_tls + (size_t)tid*N*3;
+
+        /* dynamic schedule balances the shrinking triangular inner loop */
+#ifdef _OPENMP
+        #pragma omp for schedule(dynamic,16)
+#endif
+        for (npy_intp i = 0; i < N-1; ++i)
+            {
+            const double xi = rx[i];
+            const double yi = ry[i];
+            const double zi = rz[i];
+            for (npy_intp j = i+1; j < N; ++j)
+                {
+                /* minimum image of the vector from j to i */
+                double dx = xi-rx[j];
+                dx -= box[0]*rint(dx*invLx);
+                double dy = yi-ry[j];
+                dy -= box[1]*rint(dy*invLy);
+                double dz = zi-rz[j];
+                dz -= box[2]*rint(dz*invLz);
+
+                const double rsq = dx*dx+dy*dy+dz*dz;
+                if (rsq < rcut2)
+                    {
+                    const double s2 = sigma2/rsq;
+                    const double r6i = s2*s2*s2;
+                    const double uij = 4.*epsilon*r6i*(r6i-1.)-ushift;
+                    const double firj = 24.*epsilon*r6i*(2.*r6i-1.)/rsq;
+
+                    /* half the pair energy to each particle, force by third law */
+                    ul[i] += 0.5*uij;
+                    ul[j] += 0.5*uij;
+                    fl[3*i+0] += firj*dx;
+                    fl[3*i+1] += firj*dy;
+                    fl[3*i+2] += firj*dz;
+                    fl[3*j+0] -= firj*dx;
+                    fl[3*j+1] -= firj*dy;
+                    fl[3*j+2] -= firj*dz;
+                    }
+                }
+            }
+        }
+
+    /* reduce the per-thread copies into the output arrays */
+    for (int t = 0; t < nthreads; ++t)
+        {
+#ifdef _OPENMP
+        #pragma omp simd
+#endif
+        for (npy_intp k = 0; k < N; ++k)
+            {
+            u[k] += u_tls[(size_t)t*N+k];
+            f[3*k+0] += f_tls[((size_t)t*N+k)*3+0];
+            f[3*k+1] += f_tls[((size_t)t*N+k)*3+1];
+            f[3*k+2] += f_tls[((size_t)t*N+k)*3+2];
+            }
+        }
+    Py_END_ALLOW_THREADS
+
+    free(u_tls);
+    free(f_tls);
+
+    Py_DECREF(x); Py_DECREF(y); Py_DECREF(z); Py_DECREF(L);
+    return Py_BuildValue("NN", u_arr, f_arr);
+    }
+
+static PyMethodDef methods[] = {
+    {"compute", compute, METH_VARARGS,
+     "compute(x, y, z, L, epsilon, sigma, rcut2, ushift) -> (u, f)"},
+    {NULL, NULL, 0, NULL}
+};
+
+static struct PyModuleDef module = {
+    PyModuleDef_HEAD_INIT, "_lj", "Compiled Lennard-Jones pair kernel.", -1, methods
+};
+
+PyMODINIT_FUNC
+PyInit__lj(void)
+    {
+    import_array();
+    return PyModule_Create(&module);
+    }
@@ -13,10 +13,62 @@ Tools for analyzing the :class:`~learnmolsim.state.State` of a simulation.
     :members:
 
 """
+import weakref
+
 import numpy as np
 
+from . import _kernels
+
 class Thermodynamics:
-    """Compute thermodynamic properties of a state."""
+    """Compute thermodynamic properties of a state.
+
+    All the properties are sums over the particles, so they are computed in
+    one fused scan of the state's arrays rather than one scan per property.
+    The scan is cached, so asking for several properties of the same state
+    (e.g., :meth:`kT` and then :meth:`pressure`) reuses it. The cache is
+    keyed on a modification token that the :class:`~learnmolsim.state.State`
+    bumps whenever one of its attributes is assigned, so it cannot go stale
+    through normal use.
+
+    """
+    def __init__(self):
+        self._cache_state = None
+        self._cache_key = None
+        self._cache = None
+
+    def _scan(self, state):
+        """Compute (and cache) the kinetic energy, potential energy, and virial.
+
+        Any of the three is ``None`` if the state is missing the arrays needed
+        to compute it.
+
+        The cached state is held through a weak reference rather than its
+        ``id()``: an id is only unique among live objects, so a dead state's
+        cache could otherwise be served to a new state reusing its address.
+
+        """
+        if (self._cache_state is not None and self._cache_state() is state
+                and self._cache_key == state._mod_count):
+            return self._cache
+
+        v = state.velocities
+        e = state.energies
+        f = state.forces
+        if (_kernels.thermo_scan is not None and v is not None
+                and e is not None and f is not None):
+            ke,pe,vir = _kernels.thermo_scan(v, e, state.positions, f, state.mass)
+        else:
+            # einsum reduces the dot products in one pass with no Nx3 temporary
+            ke = (0.5*state.mass*np.einsum('ij,ij->', v, v)
+                  if v is not None else None)
+            pe = np.sum(e) if e is not None else None
+            vir = (np.einsum('ij,ij->', state.positions, f)
+                   if f is not None else None)
+
+        self._cache = (ke,pe,vir)
+        self._cache_state = weakref.ref(state)
+        self._cache_key = state._mod_count
+        return self._cache
 
     def kinetic_energy(self, state):
         r"""Compute the kinetic energy.
@@ -41,7 +93,7 @@ class Thermodynamics:
             Kinetic energy of the ``state``.
 
         """
-        raise NotImplementedError()
+        return self._scan(state)[0]
 
     def potential_energy(self, state):
         r"""Compute the potential energy.
@@ -66,7 +118,7 @@ class Thermodynamics:
             Potential energy of the ``state``.
 
         """
-        raise NotImplementedError()
+        return self._scan(state)[1]
 
     def kT(self, state):
         r"""Compute the thermal energy.
@@ -95,7 +147,7 @@ class Thermodynamics:
             Thermal energy (:math:`k_{\rm B}T`) of the ``state``.
 
         """
-        raise NotImplementedError()
+        return 2.*self.kinetic_energy(state)/(3.*state.N)
 
     def pressure(self, state):
         r"""Compute the pressure.
@@ -121,4 +173,5 @@ class Thermodynamics:
             Pressure of the ``state``.
 
         """
-        raise NotImplementedError()
+        virial = self._scan(state)[2]
+        return (state.N*self.kT(state)+virial/3.)/state.box.volume()
@@ -7,12 +7,83 @@ Methods for dynamically evolving a :class:`~learnmolsim.state.State`.
 .. autosummary::
     :nosignatures:
 
+    Thermostat
     VelocityVerlet
 
+.. autoclass:: Thermostat
+    :members:
+
 .. autoclass:: VelocityVerlet
     :members:
 
 """
+import numpy as np
+
+from . import _kernels
+from . import analyze
+from . import potential
+
+class Thermostat:
+    r"""Isokinetic velocity-rescaling thermostat.
+
+    A crude but effective way to drive a system toward a target temperature
+    during equilibration. The kinetic temperature is measured, and if it has
+    wandered more than a fractional tolerance from the target, the velocities
+    are rescaled by :math:`\sqrt{k_{\rm B}T_{\rm target}/k_{\rm B}T}` so the
+    kinetic temperature matches the target exactly.
+
+    Measuring the temperature costs a reduction over the velocities, so the
+    thermostat can be applied only every ``every`` steps; calls in between do
+    no work. Note that this thermostat does not sample a proper canonical
+    ensemble, so it should not be used for production runs.
+
+    Parameters
+    ----------
+    kT : float
+        Target thermal energy.
+    tol : float
+        Fractional tolerance on the temperature before rescaling (default: 0.02).
+    every : int
+        Number of calls between applications (default: 1).
+
+    """
+    def __init__(self, kT, tol=0.02, every=1):
+        self.kT = kT
+        self.tol = tol
+        self.every = every
+        self._thermo = analyze.Thermodynamics()
+        self._countdown = 1
+
+    def apply(self, state):
+        """Apply the thermostat to a state.
+
+        The velocities of the ``state`` are rescaled if its kinetic temperature
+        is outside the tolerance. Calls between applications (see ``every``)
+        return immediately.
+
+        Parameters
+        ----------
+        state : :class:`~learnmolsim.state.State`
+            Simulation state.
+
+        Returns
+        -------
+        float
+            Thermal energy of the ``state`` after application, or ``None`` if
+            this call was skipped.
+
+        """
+        self._countdown -= 1
+        if self._countdown > 0:
+            return None
+        self._countdown = self.every
+
+        kT = self._thermo.kT(state)
+        if np.abs(kT-self.kT)/self.kT > self.tol:
+            state.velocities *= np.sqrt(self.kT/kT)
+            # rescaling sets the kinetic temperature exactly to the target
+            kT = self.kT
+        return kT
 
 class VelocityVerlet:
     r"""Velocity Verlet integration.
@@ -42,6 +113,7 @@ class VelocityVerlet:
     def __init__(self, dt, potential):
         self.dt = dt
         self.potential = potential
+        self._scratch = None
 
     @property
     def dt(self):
@@ -67,5 +139,92 @@ class VelocityVerlet:
         to be initially computed (for the first step of the update), and so they
         may need to be computed an extra time.
 
+        The first half kick, the drift, and the wrap are fused into a single
+        pass over the particles by a compiled kernel when ``numba`` is
+        installed; otherwise, the update is performed with in-place NumPy
+        array operations.
+
+        Parameters
+        ----------
+        state : :class:`~learnmolsim.state.State`
+            Simulation state.
+
+        """
+        if state.velocities is None:
+            state._set_velocities_fast(np.zeros((state.N,3), dtype=np.float64, order='F'))
+        if not state._forces_valid:
+            u,f = self.potential.compute(state)
+            state._set_energies_fast(u)
+            state._set_forces_fast(f)
+
+        half_dt_by_m = 0.5*self._dt*state._inv_mass
+
+        # scratch reused every step so no temporaries are allocated
+        if self._scratch is None or self._scratch.shape != (state.N,3):
+            self._scratch = np.empty((state.N,3), dtype=np.float64, order='F')
+
+        if _kernels.verlet_kick_drift is not None:
+            _kernels.verlet_kick_drift(state.positions, state.velocities, state._forces,
+                                       state.images, state.box.L, half_dt_by_m, self._dt)
+        else:
+            np.multiply(state._forces, half_dt_by_m, out=self._scratch)
+            state.velocities += self._scratch
+            np.multiply(state.velocities, self._dt, out=self._scratch)
+            state.positions += self._scratch
+            state.box.wrap(state.positions, state.images)
+
+        # second half kick using the forces at the new positions
+        u,f = self.potential.compute(state)
+        state._set_energies_fast(u)
+        state._set_forces_fast(f)
+        np.multiply(f, half_dt_by_m, out=self._scratch)
+        state.velocities += self._scratch
+
+        state.counter += 1
+
+    def run(self, state, nsteps):
+        """Advance the simulation state by multiple steps.
+
+        Equivalent to calling :meth:`advance` ``nsteps`` times, but when numba
+        is installed and the potential is a :class:`~learnmolsim.potential.LennardJones`,
+        the whole loop runs inside one compiled kernel. Each :meth:`advance`
+        call pays Python dispatch overhead for every array operation, which
+        dominates the step time for small systems; running the trajectory in
+        one call amortizes it over all ``nsteps``.
+
+        Parameters
+        ----------
+        state : :class:`~learnmolsim.state.State`
+            Simulation state.
+        nsteps : int
+            Number of steps to take.
+
         """
-        raise NotImplementedError()
+        # taking no steps must leave the state untouched on both paths; the
+        # compiled driver would otherwise overwrite valid energies with zeros
+        if nsteps <= 0:
+            return
+
+        if (_kernels.verlet_run is None
+                or type(self.potential) is not potential.LennardJones):
+            for _ in range(nsteps):
+                self.advance(state)
+            return
+
+        if state.velocities is None:
+            state._set_velocities_fast(np.zeros((state.N,3), dtype=np.float64, order='F'))
+        if not state._forces_valid:
+            u,f = self.potential.compute(state)
+            state._set_energies_fast(u)
+            state._set_forces_fast(np.array(f, dtype=np.float64, order='F'))
+
+        p = self.potential
+        u = _kernels.verlet_run(state.positions, state.velocities, state._forces,
+                                state.images, state.box.L,
+                                0.5*self._dt*state._inv_mass, self._dt, nsteps,
+                                p.epsilon, p.sigma, p._rcut2, p._ushift)
+        state._set_energies_fast(u)
+        # the kernel rewrote the forces in place, bypassing the setter that
+        # would invalidate the cached net force
+        state._force_sum = None
+        state.counter += nsteps
@@ -15,6 +15,9 @@ Potential energy functions.
 """
 import numpy as np
 
+from . import _kernels
+from . import neighbor
+
 class LennardJones:
     r"""Lennard-Jones pair potential.
 
@@ -77,13 +80,110 @@ class LennardJones:
         Truncation distance.
     shift : bool
         If ``True``, shift the potential to zero at ``rcut``.
+    mixed_precision : bool
+        If ``True``, evaluate the pair distances in single precision
+        (default: ``False``). Forces and energies are still accumulated in
+        double precision, so only about 7 significant digits are lost from the
+        individual pair terms — plenty for typical reduced-unit simulations —
+        while the dominant :math:`N \times N` displacement tensor of the
+        broadcast path moves half as many bytes through memory.
 
     """
-    def __init__(self, epsilon, sigma, rcut, shift=False):
-        self.epsilon = epsilon
-        self.sigma = sigma
-        self.rcut = rcut
-        self.shift = shift
+    # largest N for which compute broadcasts the full NxN pair tensor
+    _max_broadcast_N = 2000
+
+    def __init__(self, epsilon, sigma, rcut, shift=False, mixed_precision=False):
+        self._epsilon = epsilon
+        self._sigma = sigma
+        self._rcut = rcut
+        self._shift = shift
+        self.mixed_precision = mixed_precision
+        self._cache_constants()
+        self._nlist = None
+
+    @property
+    def epsilon(self):
+        """float: Interaction energy."""
+        return self._epsilon
+
+    @epsilon.setter
+    def epsilon(self, value):
+        self._epsilon = value
+        self._cache_constants()
+
+    @property
+    def sigma(self):
+        """float: Interaction length."""
+        return self._sigma
+
+    @sigma.setter
+    def sigma(self, value):
+        self._sigma = value
+        self._cache_constants()
+
+    @property
+    def rcut(self):
+        """float: Truncation distance."""
+        return self._rcut
+
+    @rcut.setter
+    def rcut(self, value):
+        self._rcut = value
+        self._cache_constants()
+
+    @property
+    def shift(self):
+        """bool: If ``True``, shift the potential to zero at :attr:`rcut`."""
+        return self._shift
+
+    @shift.setter
+    def shift(self, value):
+        self._shift = value
+        self._cache_constants()
+
+    def _cache_constants(self):
+        """Precompute the constants entering the pair kernels.
+
+        The kernels are evaluated every step, broadcast over up to :math:`N^2`
+        pair distances, so derived quantities that depend only on the potential
+        parameters are computed once here instead of per call. The kernels read
+        only these folded scalars, so this cache effectively specializes them
+        to the current parameters.
+
+        The Weeks--Chandler--Andersen special case (shifted with the cutoff at
+        the potential minimum, see the class documentation) is detected here,
+        and its constants are folded in closed form:
+        :math:`r_{\\rm cut}^2 = 2^{1/3}\\sigma^2` and a shift of exactly
+        :math:`-\\varepsilon`, avoiding any floating-point drift in the cutoff
+        test. The shift itself is applied branchlessly, since it is 0 when the
+        potential is not shifted.
+
+        """
+        # fold to plain float64 scalars so the kernels see loop-invariant
+        # constants rather than whatever types the parameters were set with
+        self._four_eps = 4.*float(self._epsilon)
+        self._sigma2 = float(self._sigma)*float(self._sigma)
+
+        # fully folded coefficients leave two multiplies and a subtract per
+        # pair in energy_force: u = r6i*(c12*r6i-c6), f*r = r2i*r6i*(fc12*r6i-fc6)
+        sigma6 = self._sigma2*self._sigma2*self._sigma2
+        self._c6 = self._four_eps*sigma6
+        self._c12 = self._c6*sigma6
+        self._fc6 = 6.*self._c6
+        self._fc12 = 12.*self._c12
+
+        # WCA: rcut = 2^(1/6) sigma, i.e., rcut^6 = 2 sigma^6, and shifted
+        wca = self._shift and abs(self._rcut**6-2.*self._sigma**6) < 1e-12
+        if wca:
+            self._rcut2 = 2.**(1./3.)*self._sigma2
+            self._ushift = -float(self._epsilon)
+        elif self._shift:
+            self._rcut2 = float(self._rcut)*float(self._rcut)
+            rc6i = (self._sigma2/self._rcut2)**3
+            self._ushift = self._four_eps*rc6i*(rc6i-1)
+        else:
+            self._rcut2 = float(self._rcut)*float(self._rcut)
+            self._ushift = 0.0
 
     def compute(self, state):
         r"""Compute energy and forces on particles.
@@ -92,20 +192,28 @@ class LennardJones:
         all :math:`N^2` pairs in the ``state``. Half of the potential energy is
         assigned to each particle in the pair.
 
-        Hint: the pair calculation can be efficiently implemented using NumPy arrays::
-
-            for i in range(state.N-1):
-                # get dr with all j particles ahead of myself (count each pair once)
-                drij = state.positions[i+1:]-state.positions[i]
-
-                # do the calculations to get uij and fij from drij
-                # ...
-
-                # accumulate the result
-                u[i] += np.sum(uij)
-                u[i+1:] += uij
-                f[i] -= np.sum(fij,axis=0)
-                f[i+1:] += fij
+        The pair calculation is fully vectorized in NumPy. The :math:`N \times N`
+        displacement tensor between all pairs is formed in a single broadcast::
+
+            dr = state.positions[None,:,:]-state.positions[:,None,:]
+            dr -= numpy.rint(dr/state.box.L)*state.box.L
+
+        so ``dr[i,j]`` is the minimum-image vector from particle *i* to particle
+        *j*. The minimum image is fused in place rather than going through
+        :meth:`~learnmolsim.state.Box.minimum_image`, which would copy the
+        tensor. The squared distances are reduced from this tensor, the diagonal
+        (self interaction) is excluded, and :meth:`energy_force` is evaluated only
+        on the pairs within ``rcut``. The energies and forces are then accumulated
+        by summing over the *j* axis. This keeps all of the :math:`O(N^2)` work
+        inside compiled NumPy loops at the cost of :math:`O(N^2)` memory, so for
+        large *N* the calculation instead walks a skinned
+        :class:`~learnmolsim.neighbor.NeighborList` that is only rebuilt when a
+        particle moves far enough to invalidate it, reducing the work to
+        :math:`O(N)`.
+
+        If ``numba`` is installed, both NumPy paths are bypassed in favor of a
+        just-in-time compiled pair loop that fuses the whole calculation without
+        array temporaries and parallelizes over particles.
 
         Parameters
         ----------
@@ -120,7 +228,86 @@ class LennardJones:
             Force on each particle.
 
         """
-        raise NotImplementedError()
+        # prefer the fused compiled kernel when numba is installed
+        if _kernels.lj_forces is not None:
+            return _kernels.lj_forces(state.x, state.y, state.z, state.box.L,
+                                      self.epsilon, self.sigma, self._rcut2, self._ushift)
+
+        u = np.zeros(state.N, dtype=np.float64)
+        f = np.zeros((state.N,3), dtype=np.float64)
+
+        if state.N <= self._max_broadcast_N:
+            # all-pairs displacement tensor, dr[i,j] points from i to j, with
+            # the minimum image applied in place to avoid copying the tensor;
+            # in mixed precision, the tensor is formed in float32, halving the
+            # bytes it streams through memory
+            if self.mixed_precision:
+                r = state.positions.astype(np.float32)
+                L = state.box.L.astype(np.float32)
+                invL = state.box._invL.astype(np.float32)
+            else:
+                r = state.positions
+                L = state.box.L
+                invL = state.box._invL
+            dr = r[None,:,:]-r[:,None,:]
+            dr -= np.rint(dr*invL)*L
+            rsq = np.einsum('ijk,ijk->ij', dr, dr)
+            # exclude self interactions from the cutoff mask
+            np.fill_diagonal(rsq, np.inf)
+            mask = rsq < self._rcut2
+
+            # energy_force promotes the masked (much smaller) set back to
+            # float64, so the pair terms are evaluated and summed in double
+            uij,firj = self.energy_force(rsq[mask])
+            umat = np.zeros(rsq.shape, dtype=np.float64)
+            umat[mask] = uij
+            fmat = np.zeros(rsq.shape, dtype=np.float64)
+            fmat[mask] = firj
+
+            # each pair is counted twice, so each particle keeps half its energy
+            u = 0.5*np.sum(umat, axis=1)
+            # force on i is -sum_j (f/r)_ij dr_ij since dr points away from i
+            f = -np.sum(fmat[:,:,None]*dr, axis=1)
+        else:
+            # Verlet list rebuilds through its cell list only when a particle
+            # has outrun the skin, so most steps are just a walk of the list
+            if (self._nlist is None or self._nlist.box is not state.box
+                    or self._nlist.rcut != self.rcut):
+                self._nlist = neighbor.NeighborList(state.box, self.rcut)
+            self._nlist.update(state.positions)
+
+            heads = self._nlist.heads
+            nbrs = self._nlist.neighbors
+            positions = state.positions
+
+            # flatten the whole list into pair index arrays so the entire walk
+            # is a handful of vectorized calls instead of a per-particle loop
+            i_idx = np.repeat(np.arange(state.N), np.diff(heads))
+            drij = positions[nbrs]-positions[i_idx]
+            drij -= np.rint(drij*state.box._invL)*state.box.L
+            rsq = np.einsum('ij,ij->i', drij, drij)
+            # the list covers rcut+skin, so apply the true cutoff here;
+            # evaluate each pair only once (j > i) and use Newton's third
+            # law for the other half
+            mask = (rsq < self._rcut2) & (nbrs > i_idx)
+            i_idx = i_idx[mask]
+            j_idx = nbrs[mask]
+
+            if i_idx.size > 0:
+                uij,firj = self.energy_force(rsq[mask])
+                fij = firj[:,None]*drij[mask]
+
+                # the accumulation over pairs is a segment sum per particle,
+                # which bincount performs in one buffered pass (unlike the
+                # unbuffered np.add.at scatter, which is much slower)
+                u += 0.5*np.bincount(i_idx, weights=uij, minlength=state.N)
+                u += 0.5*np.bincount(j_idx, weights=uij, minlength=state.N)
+                # fij points along drij, from i to j, so it pushes j and pulls i
+                for k in range(3):
+                    f[:,k] += np.bincount(j_idx, weights=fij[:,k], minlength=state.N)
+                    f[:,k] -= np.bincount(i_idx, weights=fij[:,k], minlength=state.N)
+
+        return u,f
 
     def energy_force(self, rsq):
         r"""Evaluate potential energy and force magnitude.
@@ -153,7 +340,22 @@ class LennardJones:
             Force divided
 
         """
-        raise NotImplementedError()
+        rsq,u,s = self._zeros(rsq)
+        f = np.zeros_like(u)
+
+        flags = rsq <= self._rcut2
+        # the factored forms correctly give inf (not nan) when r = 0
+        with np.errstate(divide='ignore'):
+            r2i = np.reciprocal(rsq[flags])
+            r6i = r2i*r2i*r2i
+            # the shift constant is 0 when not shifting, so no branch is needed
+            u[flags] = r6i*(self._c12*r6i-self._c6)-self._ushift
+            f[flags] = r2i*r6i*(self._fc12*r6i-self._fc6)
+
+        if s:
+            u = u.item()
+            f = f.item()
+        return u,f
 
     @classmethod
     def _zeros(cls, x):
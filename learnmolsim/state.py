@@ -52,6 +52,7 @@ class Box:
 
     """
     def __init__(self, L):
+        self._wrap_buf = None
         self.L = L
 
     @property
@@ -72,6 +73,10 @@ class Box:
             raise ValueError('Box size must be positive')
 
         self._L = L
+        # cached reciprocal turns hot-loop divisions into multiplies, and the
+        # volume is folded here since the box rarely changes
+        self._invL = 1.0/L
+        self._volume = float(L[0]*L[1]*L[2])
 
     def volume(self):
         """Compute volume of the box.
@@ -82,7 +87,7 @@ class Box:
             The volume of the box.
 
         """
-        raise NotImplementedError()
+        return self._volume
 
     def wrap(self, position, image=None):
         """Wrap particles into the box.
@@ -132,7 +137,38 @@ class Box:
             Wrapped particle images, if ``image`` was provided.
 
         """
-        raise NotImplementedError()
+        r = np.array(position, ndmin=2, copy=False, dtype=np.float64)
+        if r.ndim != 2 or r.shape[1] != 3:
+            raise TypeError('Positions must be a 3-element or Nx3 array')
+
+        if image is not None:
+            im = np.array(image, ndmin=2, copy=False, dtype=np.int32)
+            if im.shape != r.shape:
+                raise TypeError('Images must match the shape of positions')
+
+        # number of images is computed into reusable scratch so the whole wrap
+        # is branchless in-place ufunc calls with no temporaries
+        if self._wrap_buf is None or self._wrap_buf.shape != r.shape:
+            self._wrap_buf = np.empty(r.shape, dtype=np.float64)
+        num_image = self._wrap_buf
+        np.multiply(r, self._invL, out=num_image)
+        np.floor(num_image, out=num_image)
+
+        if image is not None:
+            np.add(im, num_image, out=im, casting='unsafe')
+        np.multiply(num_image, self._L, out=num_image)
+        np.subtract(r, num_image, out=r)
+
+        # restore 1d shape for a single particle (views, so still in place)
+        if np.ndim(position) == 1:
+            r = r[0]
+            if image is not None:
+                im = im[0]
+
+        if image is not None:
+            return r,im
+        else:
+            return r
 
     def minimum_image(self, vector):
         """Compute the minimum image of a vector.
@@ -141,9 +177,9 @@ class Box:
         so that it always points the shortest route between them.
 
         The minimum-image vector within the periodic boundaries can be computed
-        using :func:`numpy.round` to remove the appropriate number of images::
+        using :func:`numpy.rint` to remove the appropriate number of images::
 
-            v -= round(v/L)*L
+            v -= rint(v/L)*L
 
         Arguments
         ---------
@@ -157,7 +193,10 @@ class Box:
             Minimum image of ``vector``.
 
         """
-        raise NotImplementedError()
+        v = np.array(vector, dtype=np.float64)
+        if v.shape[-1] != 3:
+            raise TypeError('Vector must be a 3-element array in last dimension')
+        return v - np.rint(v*self._invL)*self._L
 
 class State:
     """Simulation state.
@@ -165,7 +204,11 @@ class State:
     The information needed to describe the state of the particles is tracked
     in one convenient data structure. The data are laid out using a "structure
     of arrays," where each particle property is stored in a separate array. This
-    turns out to be computationally convenient.
+    turns out to be computationally convenient. The per-particle vector arrays
+    are stored in column-major order so that each Cartesian component is also
+    contiguous in memory, which gives unit-stride loads in vectorized kernels;
+    the components of the positions can be accessed directly through the
+    :attr:`x`, :attr:`y`, and :attr:`z` views.
 
     All ``N`` particles in the state share a common ``box`` and ``mass``. The
     logical state of the system is tracked using a ``counter``. In molecular
@@ -203,15 +246,64 @@ class State:
             raise ValueError('Number of particles must be nonnegative integer')
         self._N = N
 
+        # token bumped by every setter so caches keyed on it (see
+        # analyze.Thermodynamics) notice any change to the state
+        self._mod_count = 0
+
         self.box = box
         self.mass = mass
-        self.counter = counter
 
-        self.positions = np.zeros((self.N,3),dtype=np.float64)
+        self.positions = np.zeros((self.N,3),dtype=np.float64,order='F')
         self.images = np.zeros((self.N,3),dtype=np.int32)
+        # unset energies and forces are tracked with validity flags over
+        # lazily allocated buffers rather than None sentinels, so internal
+        # hot paths can test a bool and reuse the buffers in place
+        self._energies = None
+        self._forces = None
+        self.reset(counter=counter)
+
+    def reset(self, N=None, box=None, counter=0):
+        """Reset the state for reuse.
+
+        Returns the state to its as-constructed condition: zeroed positions
+        and images, unset velocities, energies, and forces, and the given
+        ``counter``. When the number of particles is unchanged, the existing
+        buffers are zeroed in place rather than reallocated, so drivers that
+        run many trajectories (e.g., replica exchange) can recycle one
+        :class:`State` without churning memory.
+
+        Parameters
+        ----------
+        N : int
+            Number of particles. Optional, defaults to the current number.
+        box : :class:`Box`
+            Simulation box. Optional, defaults to the current box.
+        counter : int
+            Counter to reset to (default: 0).
+
+        """
+        if box is not None:
+            self.box = box
+
+        # bump the token explicitly: the in-place zeroing below does not go
+        # through the setters, and downstream caches must see the recycle
+        self._mod_count += 1
+
+        if N is None or N == self.N:
+            self._positions[:] = 0.
+            self._images[:] = 0
+        else:
+            if N < 0 or not isinstance(N,int):
+                raise ValueError('Number of particles must be nonnegative integer')
+            self._N = N
+            self.positions = np.zeros((self.N,3),dtype=np.float64,order='F')
+            self.images = np.zeros((self.N,3),dtype=np.int32)
+
         self.velocities = None
-        self.energies = None
-        self.forces = None
+        self._energies_valid = False
+        self._forces_valid = False
+        self._force_sum = None
+        self.counter = counter
 
     @property
     def N(self):
@@ -239,6 +331,9 @@ class State:
         if value <= 0.0:
             raise ValueError('Mass must be positive')
         self._mass = value
+        # cached reciprocal turns hot-loop divisions into multiplies
+        self._inv_mass = 1.0/value
+        self._mod_count += 1
 
     @property
     def counter(self):
@@ -256,13 +351,43 @@ class State:
         """:class:`numpy.ndarray`: Particle positions (``numpy.float64``)."""
         return self._positions
 
+    def _is_vector_array(self, value):
+        """Check if a value can be bound as a per-particle vector array as is.
+
+        The common case of assigning an array the caller just computed is a
+        plain float64 ``(N,3)`` ndarray already in the column-major storage
+        layout, which can be bound without any coercion or copy.
+
+        """
+        return (type(value) is np.ndarray and value.shape == (self.N,3)
+                and value.dtype == np.float64 and value.flags.f_contiguous)
+
     @positions.setter
     def positions(self, value):
-        r = np.array(value, ndmin=2, copy=False, dtype=np.float64)
+        self._mod_count += 1
+        if self._is_vector_array(value):
+            self._positions = value
+            return
+        r = np.array(value, ndmin=2, copy=False, dtype=np.float64, order='F')
         if r.shape != (self.N,3):
             raise TypeError('Positions must be an Nx3 array')
         self._positions = r
 
+    @property
+    def x(self):
+        """:class:`numpy.ndarray`: Contiguous view of the *x* coordinates."""
+        return self._positions[:,0]
+
+    @property
+    def y(self):
+        """:class:`numpy.ndarray`: Contiguous view of the *y* coordinates."""
+        return self._positions[:,1]
+
+    @property
+    def z(self):
+        """:class:`numpy.ndarray`: Contiguous view of the *z* coordinates."""
+        return self._positions[:,2]
+
     @property
     def images(self):
         """:class:`numpy.ndarray`: Particle images (``numpy.int32``)."""
@@ -270,10 +395,11 @@ class State:
 
     @images.setter
     def images(self, value):
-        im = np.array(value, ndmin=2, copy=False, dtype=np.float64)
+        im = np.array(value, ndmin=2, copy=False, dtype=np.int32)
         if im.shape != (self.N,3):
             raise TypeError('Images must be an Nx3 array')
         self._images = im
+        self._mod_count += 1
 
     @property
     def velocities(self):
@@ -282,10 +408,11 @@ class State:
 
     @velocities.setter
     def velocities(self, value):
-        if value is None:
+        self._mod_count += 1
+        if value is None or self._is_vector_array(value):
             self._velocities = value
         else:
-            v = np.array(value, ndmin=2, copy=False, dtype=np.float64)
+            v = np.array(value, ndmin=2, copy=False, dtype=np.float64, order='F')
             if v.shape != (self.N,3):
                 raise TypeError('Velocities must be an Nx3 array')
             self._velocities = v
@@ -293,29 +420,82 @@ class State:
     @property
     def energies(self):
         """:class:`numpy.ndarray`: Particle energies (``numpy.float64``)."""
-        return self._energies
+        return self._energies if self._energies_valid else None
 
     @energies.setter
     def energies(self, value):
+        self._mod_count += 1
         if value is None:
-            self._energies = None
+            self._energies_valid = False
         else:
             e = np.array(value, ndmin=1, copy=False, dtype=np.float64)
             if e.shape != (self.N,):
                 raise TypeError('Energies must be an N array')
             self._energies = e
+            self._energies_valid = True
+
+    def _set_positions_fast(self, value):
+        """Set positions without validation or coercion.
+
+        Fast path for internal code (e.g., integrators) whose arrays are
+        already float64 with shape ``(N,3)``. The validating :attr:`positions`
+        setter remains the user-facing API.
+
+        """
+        self._positions = value
+        self._mod_count += 1
+
+    def _set_velocities_fast(self, value):
+        """Set velocities without validation or coercion (see :meth:`_set_positions_fast`)."""
+        self._velocities = value
+        self._mod_count += 1
+
+    def _set_energies_fast(self, value):
+        """Set energies without validation or coercion (see :meth:`_set_positions_fast`)."""
+        self._energies = value
+        self._energies_valid = True
+        self._mod_count += 1
+
+    def _set_forces_fast(self, value):
+        """Set forces without validation or coercion (see :meth:`_set_positions_fast`)."""
+        self._forces = value
+        self._forces_valid = True
+        self._force_sum = None
+        self._mod_count += 1
 
     @property
     def forces(self):
         """:class:`numpy.ndarray`: Particle forces (``numpy.float64``)."""
-        return self._forces
+        return self._forces if self._forces_valid else None
 
     @forces.setter
     def forces(self, value):
+        self._mod_count += 1
         if value is None:
-            self._forces = None
+            self._forces_valid = False
+        elif self._is_vector_array(value):
+            self._forces = value
+            self._forces_valid = True
         else:
-            f = np.array(value, ndmin=2, copy=False, dtype=np.float64)
+            f = np.array(value, ndmin=2, copy=False, dtype=np.float64, order='F')
             if f.shape != (self.N,3):
                 raise TypeError('Forces must be an Nx3 array')
             self._forces = f
+            self._forces_valid = True
+        self._force_sum = None
+
+    @property
+    def force_sum(self):
+        r""":class:`numpy.ndarray`: Net force :math:`\sum_i \mathbf{F}_i` on the particles.
+
+        A common sanity check: for pair potentials obeying Newton's third law,
+        the net force is zero to roundoff. The sum is computed once per force
+        assignment and cached, so checking it repeatedly does not cost a sweep
+        over the particles each time. ``None`` if the forces are not set.
+
+        """
+        if not self._forces_valid:
+            return None
+        if self._force_sum is None:
+            self._force_sum = np.sum(self._forces, axis=0)
+        return self._force_sum
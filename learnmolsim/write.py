@@ -13,6 +13,8 @@ Writers to save the state of the system to a file.
     :members:
 
 """
+import os
+
 class XYZWriter:
     """Write state to an extended XYZ file.
 
@@ -43,15 +45,21 @@ class XYZWriter:
     .. note::
 
         The file handle will be kept open once the :class:`XYZWriter` is created.
+        The file is opened in binary mode, and frames are written directly to
+        the file descriptor, so each frame reaches the operating system without
+        any Python-level buffering or flushing.
 
     """
     def __init__(self, filename, mode='w'):
-        self._handle = open(filename,mode)
+        self._handle = open(filename,mode+'b')
+        self._fd = self._handle.fileno()
 
     def write(self, state):
         """Write a frame to file.
 
-        The new state will be written to ``filename`` and flushed to disk.
+        The whole frame is formatted into a single ASCII byte buffer, bypassing
+        Python's text IO (per-line encoding and newline translation), and
+        handed to :func:`os.write` in one call.
 
         .. note::
 
@@ -64,8 +72,13 @@ class XYZWriter:
             Simulation state.
 
         """
-        self._handle.write('{:d}\n'.format(state.N))
-        self._handle.write('Lattice="{:f} 0.0 0.0 0.0 {:f} 0.0 0.0 0.0 {:f}" Time={:d}\n'.format(state.box.L[0],state.box.L[1],state.box.L[2],state.counter))
-        for r in state.positions:
-            self._handle.write('A {:f} {:f} {:f}\n'.format(r[0],r[1],r[2]))
-        self._handle.flush()
+        frame = ('{:d}\n'
+                 'Lattice="{:f} 0.0 0.0 0.0 {:f} 0.0 0.0 0.0 {:f}" Time={:d}\n'.format(
+                    state.N,state.box.L[0],state.box.L[1],state.box.L[2],state.counter)
+                 + ('A %f %f %f\n'*state.N) % tuple(state.positions.ravel()))
+
+        # os.write may write fewer bytes than requested, so loop over a view
+        buf = memoryview(frame.encode('ascii'))
+        while len(buf) > 0:
+            written = os.write(self._fd, buf)
+            buf = buf[written:]
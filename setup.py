@@ -1,8 +1,45 @@
 import setuptools
+from setuptools.command.build_ext import build_ext
 
 with open("README.md","r") as f:
     long_description = f.read()
 
+# the compiled Lennard-Jones kernel is optional: the package is fully
+# functional in pure Python, so a failed build should not fail the install
+try:
+    import numpy
+    ext_modules = [
+        setuptools.Extension(
+            "learnmolsim._lj",
+            sources=["learnmolsim/_lj.c"],
+            include_dirs=[numpy.get_include()],
+            extra_compile_args=["-O3","-fopenmp"],
+            extra_link_args=["-fopenmp"],
+        )
+    ]
+except ImportError:
+    ext_modules = []
+
+class optional_build_ext(build_ext):
+    """Build extensions, but fall back to pure Python if a build fails."""
+    def run(self):
+        try:
+            build_ext.run(self)
+        except Exception:
+            print("WARNING: failed to build optional extensions, using pure Python")
+
+    def build_extension(self, ext):
+        try:
+            build_ext.build_extension(self, ext)
+        except Exception:
+            # retry without OpenMP before giving up (e.g., Apple clang)
+            ext.extra_compile_args = [a for a in ext.extra_compile_args if a != "-fopenmp"]
+            ext.extra_link_args = [a for a in ext.extra_link_args if a != "-fopenmp"]
+            try:
+                build_ext.build_extension(self, ext)
+            except Exception:
+                print("WARNING: failed to build {}, using pure Python".format(ext.name))
+
 setuptools.setup(
     name="learnmolsim",
     version="0.1.0",
@@ -22,4 +59,6 @@ setuptools.setup(
     ],
     packages=setuptools.find_packages(),
     python_requires=">=3.6",
+    ext_modules=ext_modules,
+    cmdclass={"build_ext": optional_build_ext},
 )
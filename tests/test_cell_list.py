@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+import learnmolsim as lms
+
+@pytest.fixture
+def box():
+    return lms.state.Box(10.0)
+
+def test_init(box):
+    cells = lms.neighbor.CellList(box, 2.5)
+    assert cells.num_cells == 64
+
+def test_init_wrongval(box):
+    with pytest.raises(ValueError):
+        lms.neighbor.CellList(box, -1.0)
+
+def test_members(box):
+    cells = lms.neighbor.CellList(box, 5.0)
+    cells.build([[1,1,1],[2,2,2],[6,6,6]])
+
+    # particles 0 and 1 share the first cell, particle 2 is alone in the last
+    assert set(cells.members(0)) == {0,1}
+    assert set(cells.members(cells.num_cells-1)) == {2}
+
+def test_neighbors(box):
+    cells = lms.neighbor.CellList(box, 2.5)
+    cells.build([[1,1,1],[9,9,9],[5,5,5]])
+
+    # particle 1 is a periodic neighbor of particle 0's cell, particle 2 is not
+    assert set(cells.neighbors(0)) == {0,1}
+
+def test_compute_matches_broadcast(monkeypatch):
+    # neighbor-list path must agree with the all-pairs broadcast
+    box = lms.state.Box(10.0)
+    state = lms.state.State(100, box)
+    rng = np.random.default_rng(42)
+    state.positions = box.L*rng.uniform(size=(state.N,3))
+
+    lj = lms.potential.LennardJones(1.0, 1.0, 2.5)
+
+    # disable the compiled kernel so the NumPy paths are exercised
+    monkeypatch.setattr(lms.potential._kernels, 'lj_forces', None)
+    u_ref,f_ref = lj.compute(state)
+
+    lj._max_broadcast_N = 0
+    u,f = lj.compute(state)
+
+    assert np.allclose(u, u_ref)
+    assert np.allclose(f, f_ref)
+
+def test_compute_kernel_matches_broadcast(monkeypatch):
+    # the compiled kernel (when built) must agree with the broadcast
+    if lms.potential._kernels.lj_forces is None:
+        pytest.skip('no compiled kernel available')
+
+    box = lms.state.Box(10.0)
+    state = lms.state.State(100, box)
+    rng = np.random.default_rng(42)
+    state.positions = box.L*rng.uniform(size=(state.N,3))
+
+    lj = lms.potential.LennardJones(1.0, 1.0, 2.5)
+    u,f = lj.compute(state)
+
+    monkeypatch.setattr(lms.potential._kernels, 'lj_forces', None)
+    u_ref,f_ref = lj.compute(state)
+
+    assert np.allclose(u, u_ref)
+    assert np.allclose(f, f_ref)
@@ -23,6 +23,21 @@ def test_compute(lj):
     assert np.sum(u) == pytest.approx(4*1.5*(2**-6-2**-3))
     assert np.sum(f,axis=0) == pytest.approx(0)
 
+def test_compute_mixed_precision(monkeypatch):
+    """Test single-precision distances against the double-precision path."""
+    # force the NumPy broadcast path, which is where the precision choice lives
+    monkeypatch.setattr(lms.potential._kernels, 'lj_forces', None)
+
+    b = lms.state.Box(10)
+    s = lms.state.State(20,b)
+    s.positions = b.L*np.random.default_rng(42).uniform(size=(s.N,3))
+
+    u,f = lms.potential.LennardJones(1.5,0.5,2.5).compute(s)
+    u32,f32 = lms.potential.LennardJones(1.5,0.5,2.5,mixed_precision=True).compute(s)
+
+    assert np.allclose(u32,u,rtol=1e-4)
+    assert np.allclose(f32,f,rtol=1e-4,atol=1e-4)
+
 def test_energy_force(lj):
     u,f = lj.energy_force(0.5**2)
     assert u == pytest.approx(0.0)
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+import learnmolsim as lms
+
+@pytest.fixture
+def box():
+    return lms.state.Box(10.0)
+
+def test_init_wrongval(box):
+    with pytest.raises(ValueError):
+        lms.neighbor.NeighborList(box, 2.5, skin=-0.5)
+
+def test_build(box):
+    nlist = lms.neighbor.NeighborList(box, 2.0, skin=0.5)
+    assert nlist.update([[1,1,1],[2,1,1],[9.6,1,1],[5,5,5]])
+
+    # particles 0, 1, and 2 (through the boundary) are mutual neighbors
+    def neighbors_of(i):
+        return set(nlist.neighbors[nlist.heads[i]:nlist.heads[i+1]])
+    assert neighbors_of(0) == {1,2}
+    assert neighbors_of(1) == {0,2}
+    assert neighbors_of(2) == {0,1}
+    assert neighbors_of(3) == set()
+
+def test_update_skips_small_moves(box):
+    nlist = lms.neighbor.NeighborList(box, 2.0, skin=0.5)
+    r = np.array([[1.,1,1],[2,1,1]])
+    assert nlist.update(r)
+
+    # moves smaller than skin/2 do not trigger a rebuild
+    assert not nlist.update(r+0.1)
+    assert not nlist.update(r)
+
+    # a move beyond skin/2 does
+    r[0] += [0.3,0,0]
+    assert nlist.update(r)
@@ -48,6 +48,17 @@ def test_positions(state):
     with pytest.raises(TypeError):
         state.positions = [1,2,3]
 
+def test_components(state):
+    state.positions = [[1,2,3],[4,5,6]]
+    assert np.allclose(state.x, [1,4])
+    assert np.allclose(state.y, [2,5])
+    assert np.allclose(state.z, [3,6])
+
+    # components are contiguous writable views of the positions
+    assert state.x.flags.c_contiguous
+    state.x[0] = 7
+    assert np.allclose(state.positions[0], [7,2,3])
+
 def test_images(state):
     assert np.allclose(state.images,[[0,0,0],[0,0,0]])
 
@@ -101,3 +112,47 @@ def test_forces(state):
 
     with pytest.raises(TypeError):
         state.forces = [1,2,3]
+
+def test_reset(state):
+    state.positions = [[1,2,3],[4,5,6]]
+    state.velocities = [[1,1,1],[2,2,2]]
+    state.forces = [[0,0,1],[0,0,-1]]
+    state.counter = 5
+
+    # same N reuses the buffers, zeroing them in place
+    positions = state.positions
+    state.reset()
+    assert state.positions is positions
+    assert np.allclose(state.positions, [[0,0,0],[0,0,0]])
+    assert state.velocities is None
+    assert state.forces is None
+    assert state.counter == 0
+
+    # changing N reallocates
+    state.reset(N=3)
+    assert state.N == 3
+    assert np.allclose(state.positions, [[0,0,0],[0,0,0],[0,0,0]])
+
+def test_reset_invalidates_caches(state):
+    # recycling a state between trajectories must not reuse cached results
+    thermo = lms.analyze.Thermodynamics()
+
+    state.velocities = [[1,1,1],[1,1,1]]
+    assert thermo.kinetic_energy(state) == pytest.approx(3.)
+
+    state.reset()
+    state.velocities = [[2,2,2],[2,2,2]]
+    assert thermo.kinetic_energy(state) == pytest.approx(12.)
+
+def test_force_sum(state):
+    assert state.force_sum is None
+
+    state.forces = [[1,2,3],[-1,-2,3]]
+    assert np.allclose(state.force_sum, [0,0,6])
+
+    # the cached sum is refreshed when the forces are reassigned
+    state.forces = [[1,2,3],[-1,-2,-3]]
+    assert np.allclose(state.force_sum, [0,0,0])
+
+    state.forces = None
+    assert state.force_sum is None
@@ -30,3 +30,36 @@ def test_pressure(state,thermo):
     pex = (6-12)/(3*10**3)
 
     assert thermo.pressure(state) == pytest.approx(pid+pex)
+
+def test_cache_invalidation(state,thermo):
+    # reassigning an array must not return a stale cached scan
+    assert thermo.kT(state) == pytest.approx(25.)
+    state.velocities *= 2
+    assert thermo.kT(state) == pytest.approx(100.)
+
+def test_cache_dead_state(thermo):
+    # a new state reusing a dead state's memory address must not hit its cache
+    def make(speed):
+        s = lms.state.State(2,lms.state.Box(10.0),mass=10.0)
+        s.velocities = [[speed,-speed,speed],[-2*speed,2*speed,-2*speed]]
+        return s
+
+    s = make(1)
+    assert thermo.kT(s) == pytest.approx(25.)
+    del s
+
+    s = make(2)
+    assert thermo.kT(s) == pytest.approx(100.)
+
+def test_cache_partial_state(thermo):
+    # scanning before the forces exist must not pin virial=None in the cache
+    s = lms.state.State(2,lms.state.Box(10.0),mass=10.0)
+    s.velocities = [[1,-1,1],[-2,2,-2]]
+    assert thermo.kT(s) == pytest.approx(25.)
+
+    s.positions = [[1,1,1],[2,2,2]]
+    s.energies = [3,-4]
+    s.forces = [[1,2,3],[-1,-2,-3]]
+    pid = 2*25/10**3
+    pex = (6-12)/(3*10**3)
+    assert thermo.pressure(s) == pytest.approx(pid+pex)
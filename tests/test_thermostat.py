@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+import learnmolsim as lms
+
+@pytest.fixture
+def state():
+    s = lms.state.State(2,lms.state.Box(10.0),mass=10.0)
+    s.velocities = [[1,-1,1],[-2,2,-2]]
+    return s
+
+def test_rescale(state):
+    # state has kT = 25, far from target
+    thermostat = lms.dynamics.Thermostat(1.0)
+    kT = thermostat.apply(state)
+    assert kT == pytest.approx(1.0)
+    assert lms.analyze.Thermodynamics().kT(state) == pytest.approx(1.0)
+
+def test_within_tolerance(state):
+    # target matches current kT, so velocities are untouched
+    thermostat = lms.dynamics.Thermostat(25.0)
+    kT = thermostat.apply(state)
+    assert kT == pytest.approx(25.0)
+    assert np.allclose(state.velocities, [[1,-1,1],[-2,2,-2]])
+
+def test_every(state):
+    thermostat = lms.dynamics.Thermostat(1.0,every=3)
+    assert thermostat.apply(state) == pytest.approx(1.0)
+    assert thermostat.apply(state) is None
+    assert thermostat.apply(state) is None
+    assert thermostat.apply(state) == pytest.approx(1.0)
@@ -16,7 +16,8 @@ class ConstantPotential:
 
     def compute(self, state):
         u = -np.sum(self.f*state.positions,axis=1)
-        f = self.f*np.ones((state.N,3))
+        # broadcast view avoids materializing N copies of the constant force
+        f = np.broadcast_to(self.f,(state.N,3))
 
         return u,f
 
@@ -55,3 +56,57 @@ def test_advance(ig):
     assert np.allclose(s.velocities, [[0.1,-0.2,0.3]])
     # half that times dt again because only use the half-step velocity
     assert np.allclose(s.positions, [[0.005,9.99,0.015]])
+
+def test_run(ig):
+    s = lms.state.State(1,lms.state.Box(10.0),mass=10.0)
+    s.positions = [[0,9.9,5]]
+    s.velocities = [[-1,2,1]]
+
+    s2 = lms.state.State(1,lms.state.Box(10.0),mass=10.0)
+    s2.positions = [[0,9.9,5]]
+    s2.velocities = [[-1,2,1]]
+
+    # running multiple steps matches advancing one step at a time
+    ig.run(s,3)
+    for _ in range(3):
+        ig.advance(s2)
+
+    assert s.counter == 3
+    assert np.allclose(s.positions,s2.positions)
+    assert np.allclose(s.velocities,s2.velocities)
+
+    # zero steps is a no-op
+    e = np.array(s.energies)
+    ig.run(s,0)
+    assert s.counter == 3
+    assert np.allclose(s.energies,e)
+
+def test_run_kernel_matches_advance():
+    # the compiled trajectory driver must agree with stepping advance
+    if lms.dynamics._kernels.verlet_run is None:
+        pytest.skip('no compiled driver available')
+
+    box = lms.state.Box(5.0)
+    rng = np.random.default_rng(42)
+    lj = lms.potential.LennardJones(1.0, 1.0, 2.5)
+    ig = lms.dynamics.VelocityVerlet(0.005, lj)
+
+    positions = box.L*rng.uniform(size=(10,3))
+    velocities = rng.normal(scale=0.1, size=(10,3))
+
+    s = lms.state.State(10, box)
+    s.positions = positions.copy()
+    s.velocities = velocities.copy()
+    s2 = lms.state.State(10, box)
+    s2.positions = positions.copy()
+    s2.velocities = velocities.copy()
+
+    ig.run(s, 10)
+    for _ in range(10):
+        ig.advance(s2)
+
+    assert s.counter == s2.counter
+    assert np.allclose(s.positions, s2.positions)
+    assert np.allclose(s.velocities, s2.velocities)
+    assert np.allclose(s.energies, s2.energies)
+    assert np.array_equal(s.images, s2.images)